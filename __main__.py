@@ -19,6 +19,14 @@ while idx < n:
     idx += 1
 
 
+# Wrapping an iterable
+for item in loop_printer.loop(range(10), fraction=4):
+    time.sleep(0.2)
+
+for item in loop_printer.loop(range(2000000), min_interval=0.5, time_stamp=True):
+    pass
+
+
 # Time and date stamp
 
 n = 4
@@ -102,6 +110,19 @@ for idx in range(n):
     loop_printer.loop_print(idx, n,
                             step_time=True, avg_step_time=True, total_time=True)
 
+# Phases of an iteration
+phases = loop_printer.phases
+n = 6
+for idx in range(n):
+    with phases("load"):
+        time.sleep(0.2)
+    phases.mark("compute")
+    time.sleep(0.6)
+    phases.mark("write")
+    time.sleep(0.1)
+    phases.stop()
+    loop_printer.loop_print(idx, n, fraction=3, phase_times=True)
+
 # The works
 the_list = range(0, 20)
 for idx in the_list:
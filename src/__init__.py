@@ -1 +1,6 @@
 from loop_printer.src.printer import LoopPrinter
+from loop_printer.src.trace import TimingTrace, TimingTraceRecorder, synthetic_trace
+from loop_printer.src.phases import LoopPhaseTimer
+from loop_printer.src.resources import LoopResourceMonitor
+from loop_printer.src.futures import FuturesProgress
+from loop_printer.src.history import RunHistory
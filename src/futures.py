@@ -0,0 +1,171 @@
+import functools
+import threading
+import time
+from concurrent import futures as _futures
+
+from loop_printer.src.printer import LoopPrinter
+
+
+class _FuturesRun:
+    """
+    Counters of the futures tracked by a single call to FuturesProgress.
+    Callbacks hold on to their run, so futures of earlier calls can not disturb the counts of later ones.
+    """
+    def __init__(self, futures):
+        self.futures = futures  # type: [Future]
+        self.total = len(futures)
+        self.completed = 0
+        self.failed = 0
+        self.done = threading.Event()
+        if not futures:
+            self.done.set()
+
+    @property
+    def in_flight(self):
+        return self.total - self.completed - self.failed
+
+
+class FuturesProgress:
+    """
+    Drives a LoopPrinter from the completion callbacks of concurrent.futures.
+    The count is the number of finished futures (in completion order), so rate and time left are computed from
+    the completion throughput. Failed (or cancelled) futures count as finished and do not stop the reporting.
+    The message of each print shows the number of succeeded, failed and in-flight futures.
+
+        progress = FuturesProgress(time_left=True, fraction=10)
+        with ThreadPoolExecutor() as executor:
+            for result in progress.map(executor, work, items):
+                ...
+    """
+    def __init__(self, loop_printer=None, name="Finished", **loop_print_options):
+        """
+        :param LoopPrinter loop_printer: Printer to use. A new one is made if None.
+        :param str name: Name of the counter in the prints.
+        :param loop_print_options: Options passed on to LoopPrinter.loop_print (fx. fraction and time_left).
+            The counting-options and the message are determined by FuturesProgress.
+        """
+        for option in ("count", "list_or_total", "first_count", "is_zero_indexed", "message"):
+            if option in loop_print_options:
+                raise ValueError("{} can not be passed to FuturesProgress, "
+                                 "as it is determined from the futures.".format(option))
+
+        self.loop_printer = loop_printer if loop_printer is not None else LoopPrinter()
+        self.name = name
+        self.loop_print_options = loop_print_options
+        self._lock = threading.Lock()
+        self._run = _FuturesRun(futures=[])
+
+    @property
+    def total(self):
+        return self._run.total
+
+    @property
+    def completed(self):
+        return self._run.completed
+
+    @property
+    def failed(self):
+        return self._run.failed
+
+    @property
+    def in_flight(self):
+        """
+        Number of tracked futures that have not finished yet (running or queued).
+        :return: int
+        """
+        return self._run.in_flight
+
+    def _print(self, run):
+        self.loop_printer.loop_print(run.completed + run.failed, run.total,
+                                     first_count=0, is_zero_indexed=False, name=self.name,
+                                     message="{:,d} succeeded, {:,d} failed, {:,d} in flight".format(
+                                         run.completed, run.failed, run.in_flight),
+                                     **self.loop_print_options)
+
+    def _on_done(self, run, future):
+        failed = future.cancelled() or future.exception() is not None
+        with self._lock:
+            if failed:
+                run.failed += 1
+            else:
+                run.completed += 1
+
+            # Futures of earlier runs (fx. after a break or a timeout) are counted, but do not print
+            try:
+                if run is self._run:
+                    self._print(run)
+            finally:
+                if run.in_flight == 0:
+                    run.done.set()
+
+    def track(self, futures):
+        """
+        Starts reporting progress on a collection of futures.
+        :param Iterable[Future] futures: The futures to track.
+        :return: [Future]
+        """
+        run = _FuturesRun(futures=list(futures))
+        with self._lock:
+            self._run = run
+            if run.futures:
+                self._print(run)
+
+        # Futures that are already done call back immediately
+        for future in run.futures:
+            future.add_done_callback(functools.partial(self._on_done, run))
+        return run.futures
+
+    def map(self, executor, fn, *iterables, timeout=None):
+        """
+        Like Executor.map, but with progress reported in completion order.
+        All calls are submitted at once. Results are yielded in the order of the inputs, and exceptions are raised
+        when the result of the failed call is reached.
+        :param Executor executor: Executor to submit calls to.
+        :param Callable fn: Function to call.
+        :param iterables: Arguments for fn.
+        :param float timeout: Maximum number of seconds to wait for all results.
+        :return: Iterator
+        """
+        futures = self.track([executor.submit(fn, *args) for args in zip(*iterables)])
+        run = self._run
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def result_iterator():
+            try:
+                for future in futures:
+                    yield future.result(timeout=None if deadline is None else deadline - time.monotonic())
+
+                # Callbacks run just after results are available, so make sure the final print is done
+                run.done.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+            # As Executor.map: calls that have not started are cancelled on timeouts, errors and early exits
+            finally:
+                for future in futures:
+                    future.cancel()
+        return result_iterator()
+
+    def as_completed(self, futures, timeout=None):
+        """
+        Like concurrent.futures.as_completed, but with progress reported.
+        :param Iterable[Future] futures: The futures to track.
+        :param float timeout: Maximum number of seconds to wait.
+        :return: Iterator[Future]
+        """
+        futures = self.track(futures)
+        run = self._run
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def future_iterator():
+            yield from _futures.as_completed(futures, timeout=timeout)
+
+            # Waiters are woken before callbacks run, so make sure the final print is done
+            run.done.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return future_iterator()
+
+    def wait(self, timeout=None):
+        """
+        Waits for all futures of the latest call to finish (and thereby for the final print).
+        :param float timeout: Maximum number of seconds to wait.
+        :return: bool: True if all futures finished.
+        """
+        return self._run.done.wait(timeout)
@@ -0,0 +1,117 @@
+import json
+import os
+
+import numpy as np
+
+
+class RunProfile:
+    """
+    Step-time profile of a previous run: the time passed at evenly spaced fractions of the loop.
+    """
+    def __init__(self, seconds, runs=1):
+        """
+        :param [float] seconds: Time passed (since first iteration) at fractions 0, 1 / k, 2 / k, ..., 1 of the loop.
+        :param int runs: Number of runs averaged into the profile.
+        """
+        self.seconds = list(seconds)  # type: [float]
+        self.runs = runs
+
+    @classmethod
+    def from_run(cls, counts, seconds, first_count, total_counts, n_points):
+        """
+        Makes a profile from the recorded counts and times of a run.
+        :param [int] counts: Counts of the samples.
+        :param [float] seconds: Time passed (since first iteration) at each sample.
+        :param int first_count: First count of the loop.
+        :param int total_counts: Last count of the loop.
+        :param int n_points: Number of points in profile.
+        :return: RunProfile
+        """
+        fractions = (np.array(counts, dtype=float) - first_count) / max(total_counts - first_count, 1)
+        profile = np.interp(np.linspace(0, 1, n_points), fractions, np.array(seconds, dtype=float))
+        return cls(seconds=profile.tolist())
+
+    def seconds_left(self, count, first_count, total_counts):
+        """
+        Time left of the profiled run from a given count.
+        :param int count: Current iteration.
+        :param int first_count: First count of the loop.
+        :param int total_counts: Last count of the loop.
+        :return: float
+        """
+        fraction = (count - first_count) / max(total_counts - first_count, 1)
+        seconds = np.interp(fraction, np.linspace(0, 1, len(self.seconds)), self.seconds)
+        return float(max(0.0, self.seconds[-1] - seconds))
+
+
+class RunHistory:
+    """
+    Stores step-time profiles of previous runs in a small local JSON-file, keyed by loop name, first and last count
+    (so resumed runs, starting at a later count, do not mix with full runs).
+    The profiles are used as a prior for estimating the time left, from the very first iteration of the next run.
+    """
+    def __init__(self, path, n_points=21, prior_weight=10, smoothing=0.5):
+        """
+        :param str path: JSON-file with the run history.
+        :param int n_points: Number of points in each profile.
+        :param float prior_weight: Number of iterations the prior weighs as. The live estimate takes over as more
+            iterations pass.
+        :param float smoothing: Weight of the newest run when updating a profile (1 only keeps the newest run).
+        """
+        self.path = path
+        self.n_points = n_points
+        self.prior_weight = prior_weight
+        self.smoothing = smoothing
+
+    @staticmethod
+    def _key(name, first_count, total_counts):
+        return "{}|{}|{}".format(name, first_count, total_counts)
+
+    def _read(self):
+        if not os.path.isfile(self.path):
+            return {}
+        with open(self.path, "r") as file:
+            try:
+                return json.load(file)
+            except ValueError:
+                return {}
+
+    def load(self, name, first_count, total_counts):
+        """
+        Profile of previous runs of a loop.
+        :param str name: Name of loop.
+        :param int first_count: First count of the loop.
+        :param int total_counts: Total number of iterations in loop.
+        :return: RunProfile | None
+        """
+        entry = self._read().get(self._key(name, first_count, total_counts))
+        if entry is None:
+            return None
+        return RunProfile(seconds=entry["seconds"], runs=entry["runs"])
+
+    def save(self, name, first_count, total_counts, profile):
+        """
+        Updates the profile of a loop with a new run.
+        :param str name: Name of loop.
+        :param int first_count: First count of the loop.
+        :param int total_counts: Total number of iterations in loop.
+        :param RunProfile profile: Profile of the new run.
+        """
+        history = self._read()
+        key = self._key(name, first_count, total_counts)
+
+        # Blend with previous runs
+        previous = history.get(key)
+        seconds = profile.seconds
+        runs = 1
+        if previous is not None and len(previous["seconds"]) == len(seconds):
+            seconds = [self.smoothing * new + (1 - self.smoothing) * old
+                       for new, old in zip(seconds, previous["seconds"])]
+            runs = previous["runs"] + 1
+        history[key] = {"seconds": seconds, "runs": runs}
+
+        # Write atomically, so an interrupted run does not destroy the history
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(history, file)
+        os.replace(temporary_path, self.path)
@@ -0,0 +1,144 @@
+from time import perf_counter_ns
+
+from loop_printer.src.utility import _duration_ns_str
+
+
+class LoopPhaseTimer:
+    """
+    Accumulates the time spent in named phases of a loop-body (fx. loading, compute and writing).
+    Phases are either marked explicitly:
+        phases.mark("load")
+        ...
+        phases.mark("compute")
+        ...
+        phases.stop()
+    or used as context managers:
+        with phases("load"):
+            ...
+    Marking a phase ends the current one. Phases can not be nested.
+    """
+    __slots__ = ("names", "totals", "counts", "_indices", "_current", "_start", "_next",
+                 "_checkpoint_totals", "_checkpoint_counts")
+
+    def __init__(self, names=()):
+        """
+        :param [str] names: Phases known in advance (counters for these are allocated up front).
+        """
+        self.names = []  # type: [str]
+        self.totals = []  # type: [int]
+        self.counts = []  # type: [int]
+        self._indices = {}  # type: {str: int}
+        self._current = -1
+        self._start = 0
+        self._next = -1
+        self._checkpoint_totals = []  # type: [int]
+        self._checkpoint_counts = []  # type: [int]
+        for name in names:
+            self._add(name)
+
+    def _add(self, name):
+        self._indices[name] = len(self.names)
+        self.names.append(name)
+        self.totals.append(0)
+        self.counts.append(0)
+        return self._indices[name]
+
+    def reset(self):
+        """
+        Zeros all counters (the known phases are kept).
+        """
+        self.totals = [0] * len(self.names)
+        self.counts = [0] * len(self.names)
+        self._current = -1
+        self._checkpoint_totals = []
+        self._checkpoint_counts = []
+
+    def checkpoint(self):
+        """
+        Remembers the counters (the LoopPrinter does this at every call of loop_print).
+        """
+        self._checkpoint_totals = list(self.totals)
+        self._checkpoint_counts = list(self.counts)
+
+    def new_loop(self):
+        """
+        Drops what was accumulated up to the last checkpoint (the previous loop), but keeps what has been accumulated
+        since (the first iteration of the new loop, if loop_print is called at the end of the loop-body).
+        If loop_print is called at the top of the loop-body, the last iteration of the previous loop is kept instead.
+        """
+        n_checkpoint = len(self._checkpoint_totals)
+        self.totals[:n_checkpoint] = [total - previous for total, previous
+                                      in zip(self.totals, self._checkpoint_totals)]
+        self.counts[:n_checkpoint] = [count - previous for count, previous
+                                      in zip(self.counts, self._checkpoint_counts)]
+        self._checkpoint_totals = []
+        self._checkpoint_counts = []
+
+    def mark(self, name):
+        """
+        Ends the current phase (if any) and starts a new one.
+        :param str name: Name of phase.
+        """
+        now = perf_counter_ns()
+        current = self._current
+        if current >= 0:
+            self.totals[current] += now - self._start
+            self.counts[current] += 1
+        try:
+            self._current = self._indices[name]
+        except KeyError:
+            self._current = self._add(name)
+        self._start = now
+
+    def stop(self):
+        """
+        Ends the current phase.
+        """
+        now = perf_counter_ns()
+        current = self._current
+        if current >= 0:
+            self.totals[current] += now - self._start
+            self.counts[current] += 1
+            self._current = -1
+
+    # The context manager does the work of mark() and stop() inline, as it is used in tight loops
+    def __call__(self, name):
+        try:
+            self._next = self._indices[name]
+        except KeyError:
+            self._next = self._add(name)
+        return self
+
+    def __enter__(self):
+        now = perf_counter_ns()
+        current = self._current
+        if current >= 0:
+            self.totals[current] += now - self._start
+            self.counts[current] += 1
+        self._current = self._next
+        self._start = now
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        now = perf_counter_ns()
+        current = self._current
+        if current >= 0:
+            self.totals[current] += now - self._start
+            self.counts[current] += 1
+            self._current = -1
+
+    def breakdown(self):
+        """
+        Compact breakdown of the phases: share of the total phase-time and average time of each phase.
+        Example: "[load 20% 1.2ms, compute 75% 4.5ms, write 5% 301µs]"
+        Empty if no phases have been recorded.
+        :return: str
+        """
+        total = sum(self.totals)
+        parts = []
+        for name, phase_total, phase_count in zip(self.names, self.totals, self.counts):
+            if phase_count == 0:
+                continue
+            parts.append("{} {:.0%} {}".format(name, phase_total / total if total else 0.0,
+                                               _duration_ns_str(phase_total // phase_count)))
+        return "[" + ", ".join(parts) + "]" if parts else ""
@@ -1,11 +1,21 @@
+import collections.abc
+import time
 import warnings
 
+from loop_printer.src.history import RunHistory
+from loop_printer.src.phases import LoopPhaseTimer
+from loop_printer.src.resources import LoopResourceMonitor
 from loop_printer.src.timer import LoopPrinterTimer
-from loop_printer.src.utility import make_header, ensure_fraction_and_total, is_step, convert_indentation
+from loop_printer.src.trace import TimingTraceRecorder
+from loop_printer.src.utility import make_header, ensure_fraction_and_total, is_step, next_step, convert_indentation
+
+# Maximum number of items between clock-checks of LoopPrinter.loop. A clock-check costs about as much as a dozen
+# iterations of the wrapper, while the cap bounds how many items a print can be delayed by after a sudden slow-down.
+_MAX_CLOCK_STRIDE = 16
 
 
 class LoopPrinter(object):
-    def __init__(self, line_length=75, print_function=print):
+    def __init__(self, line_length=75, print_function=print, trace_recorder=None, run_history=None, phase_names=()):
         self.last_print_count = None  # type: int
         self.line_length = line_length
         self.indentation = ""
@@ -14,12 +24,22 @@ class LoopPrinter(object):
 
         # Timing
         self.timer = LoopPrinterTimer()
+        self.trace_recorder = trace_recorder  # type: TimingTraceRecorder
+        self.run_history = run_history  # type: RunHistory
+        self.phases = LoopPhaseTimer(names=phase_names)
+
+        # Resource usage
+        self.resources = LoopResourceMonitor()
 
     def _reset(self):
         self.last_print_count = None  # type: int
 
         # Timing
         self.timer.reset()
+        self.phases.new_loop()
+        self.resources.reset()
+        if self.trace_recorder is not None:
+            self.trace_recorder.reset()
 
     def loop_print(self,
                    count, list_or_total=None, fraction=-1,  # Main options
@@ -32,6 +52,8 @@ class LoopPrinter(object):
                    time_left=False, time_left_method="linear",  # Time left estimation
                    time_memory=100,  # Number of samples to keep for estimating time left
                    total_time=False, avg_step_time=False, step_time=False,  # Computed timings
+                   phase_times=False,  # Breakdown of time spent in phases of the loop-body
+                   memory=False, memory_peak=False, cpu_usage=False,  # Resource usage
                    time_microseconds=False, stamp_microseconds=False,  # General settings
                    indentation=0, single_line=False,
                    print_options=None,  # Options passed on,
@@ -86,11 +108,24 @@ class LoopPrinter(object):
             "polyX"             : Polynomial of 'X'-degree. Fx. "poly2"
             "exp"               : Exponential
         :param int time_memory: Number of time-stamps to keep in memory for estimating timing-information.
+            If the LoopPrinter is given a run_history, the time left is also estimated from previous runs with the same
+            name, first_count and number of iterations (available from the first iteration).
 
         Computed timings:
         :param bool total_time: Time since first print (total time)
         :param bool avg_step_time: Average step time
         :param bool step_time: Time difference since last print
+        :param bool phase_times: Share of time and average time of each phase marked with loop_printer.phases.
+            The phase-counters are reset at the first iteration of each loop (keeping the phases of that iteration).
+            This assumes loop_print is called at the end of the loop-body. If it is called at the top, the last
+            iteration of the previous loop is kept instead, so call loop_printer.phases.reset() before such a loop.
+            Pass phase_names to the LoopPrinter to allocate the counters of known phases up front.
+
+        Resource usage (only sampled when printing):
+        :param bool memory: Resident memory (RSS) of the process and its growth since the first iteration.
+        :param bool memory_peak: Peak resident memory of the process.
+        :param bool cpu_usage: Process CPU-time over wall-time since the last print.
+            Tells CPU-bound (~100% or more with threads) from I/O-bound (low) parts of a loop.
 
         General settings:
         :param bool | int stamp_microseconds: Use microseconds when printing time stamp.
@@ -133,8 +168,23 @@ class LoopPrinter(object):
         auto_print = is_first_call or count == total_counts
         do_print = is_step(fraction=fraction, n=total_counts, count=count, first_count=first_count) or auto_print
 
-        # Update times and steps
+        # Update times and steps (profiles of the run are only needed for the run history)
+        self.timer.record_profile = self.run_history is not None and total_counts is not None
         self.timer.update_times_steps(count=count, is_first_call=is_first_call, memory=time_memory)
+        if self.trace_recorder is not None:
+            self.trace_recorder.record(count=count, total_counts=total_counts)
+
+        # Run history (prior for time left at first call, profile saved at last call)
+        if self.run_history is not None and total_counts is not None:
+            if is_first_call:
+                self.timer.prior = self.run_history.load(name=name, first_count=first_count,
+                                                         total_counts=total_counts)
+                self.timer.prior_weight = self.run_history.prior_weight
+            elif count == total_counts:
+                profile = self.timer.run_profile(total_counts=total_counts, n_points=self.run_history.n_points)
+                if profile is not None:
+                    self.run_history.save(name=name, first_count=first_count, total_counts=total_counts,
+                                          profile=profile)
 
         # Make boolean microseconds-options an integer of precision
         if time_microseconds:
@@ -180,6 +230,16 @@ class LoopPrinter(object):
                                                    stamp_microseconds=stamp_microseconds,
                                                    time_microseconds=time_microseconds)
 
+            # Phase breakdown
+            phase_message = self.phases.breakdown() if phase_times else ""
+            if phase_message:
+                time_message += (" " if time_message else "") + phase_message
+
+            # Resource usage
+            if memory or memory_peak or cpu_usage:
+                time_message += (" " if time_message else "") + self.resources.resource_message(
+                    memory=memory, memory_peak=memory_peak, cpu_usage=cpu_usage)
+
             # Main stamp
             if total_counts:
                 main_stamp = "{0} {1:" + str(len(str(total_counts))) + ",d} / {2:,d}"
@@ -192,7 +252,8 @@ class LoopPrinter(object):
             main_stamp = main_stamp.format(name, count, total_counts)
 
             # Printing formatter
-            arrow_needed = time_stamp or date_stamp or step_time or avg_step_time or total_time or time_left
+            arrow_needed = time_stamp or date_stamp or step_time or avg_step_time or total_time or time_left \
+                or phase_message or memory or memory_peak or cpu_usage
             final_string = self.indentation + time_message + (" -> " if arrow_needed else "")
             final_string += main_stamp
             pre_message_length = len(final_string) + 2
@@ -225,9 +286,107 @@ class LoopPrinter(object):
             # For next iteration
             self.last_print_count = count
 
+        # Phases are accumulated per loop
+        self.phases.checkpoint()
+
         # Return
         return do_print, count + (0 if first_count else 1)
 
+    def loop(self, iterable, fraction=-1, min_interval=None, *, first_count=0, **loop_print_options):
+        """
+        Wraps an iterable and yields its items unchanged, while printing the progress of the loop.
+        The print of an item is made when the loop-body of the item is done.
+            for item in loop_printer.loop(items, fraction=10, time_left=True):
+                ...
+        Between prints the cost per item is a counter increment and a comparison.
+
+        :param Iterable iterable: The items of the loop.
+            If it is sized, len(iterable) is the total number of iterations.
+        :param float fraction: Determines the number of prints (see loop_print).
+        :param float | None min_interval: Minimum number of seconds between prints.
+            Prints determined by fraction are skipped until this time has passed since last print.
+            The first and last iteration is always printed.
+            The clock is only checked every k'th of the iterations allowed by fraction, where k is adapted to the
+            speed of the loop: it starts at 1, at most doubles per check (up to 16) and is halved when items get slow.
+            After a sudden slow-down of the items, a print can thus be delayed by up to 16 (slow) items.
+        :param int first_count: Count of the first item.
+        :param loop_print_options: Options passed on to loop_print (except the counting-options list_or_total and
+            is_zero_indexed, which are determined by the wrapper).
+        """
+        for option in ("list_or_total", "is_zero_indexed"):
+            if option in loop_print_options:
+                raise ValueError("{} can not be passed to LoopPrinter.loop, "
+                                 "as it is determined from the iterable.".format(option))
+
+        # Ensure counting
+        list_or_total = first_count + len(iterable) if isinstance(iterable, collections.abc.Sized) else None
+        fraction, total_counts = ensure_fraction_and_total(fraction=fraction, list_or_total=list_or_total)
+        last_count = total_counts - 1 if total_counts is not None else None
+
+        # Time-based throttling: the clock is read at clock-checks, and once min_interval has passed the wrapper is
+        # armed to print at the next print-point determined by fraction
+        perf_counter = time.perf_counter
+        clock_stride = 1
+        last_check_time = last_print_time = perf_counter()
+        check_interval = min_interval / 10 if min_interval is not None else None
+        next_clock = first_count
+        armed = True
+
+        last_printed_count = None
+        count = next_check = first_count
+        for item in iterable:
+            yield item
+
+            # Print-points (and clock-checks)
+            if count == next_check:
+                if min_interval is None:
+                    do_print = True
+                else:
+                    # Clock-check
+                    if count >= next_clock:
+                        now = perf_counter()
+
+                        # Adapt stride of clock-checks to check the clock ~10 times per interval.
+                        # The stride at most doubles per check (up to a cap) and is halved when items get slow,
+                        # so a burst of fast items can not stop the clock from being read for long.
+                        if now - last_check_time < check_interval:
+                            if clock_stride < _MAX_CLOCK_STRIDE:
+                                clock_stride *= 2
+                        elif clock_stride > 1:
+                            clock_stride //= 2
+                        last_check_time = now
+                        next_clock = count + clock_stride
+                        armed = armed or now - last_print_time >= min_interval
+
+                    # Counts in is_step are 1-indexed
+                    do_print = count == last_count or armed and (
+                        count == first_count or is_step(fraction=fraction, n=total_counts, count=count + 1,
+                                                        first_count=first_count + 1))
+                    if do_print:
+                        armed = False
+                        last_print_time = perf_counter()
+
+                if do_print:
+                    printed, _ = self.loop_print(count, total_counts, fraction, first_count=first_count,
+                                                 **loop_print_options)
+                    if printed:
+                        last_printed_count = count
+
+                # Next check: the next print-point, or the next clock-check while waiting for min_interval to pass
+                if min_interval is None or armed:
+                    next_check = next_step(fraction=fraction, n=total_counts, count=count + 1,
+                                           first_count=first_count + 1) - 1
+                else:
+                    next_check = next_clock
+                if last_count is not None:
+                    next_check = min(next_check, last_count)
+
+            count += 1
+
+        # The last item of unsized iterables is only known now (and printed with the now known total)
+        if count > first_count and last_printed_count != count - 1:
+            self.loop_print(count - 1, count, fraction, first_count=first_count, **loop_print_options)
+
     def end_line(self):
         self.print_function(self.header_indentation + "-" * self.line_length)
 
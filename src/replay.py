@@ -0,0 +1,143 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from loop_printer.src.timer import LoopPrinterTimer
+from loop_printer.src.trace import TimingTrace, SYNTHETIC_TRACES, synthetic_trace
+
+
+class ReplayResult:
+    """
+    Estimated and actual time left of a single time-left method, replayed over a timing trace.
+    """
+    def __init__(self, method, time_memory):
+        self.method = method
+        self.time_memory = time_memory
+        self.counts = []  # type: [int]
+        self.elapsed = []  # type: [float]
+        self.estimated = []  # type: [float]
+        self.actual = []  # type: [float]
+        self.cpu_time = 0.0
+
+    @property
+    def errors(self):
+        """
+        Estimated minus actual time left (seconds) at each sample with an estimate.
+        :return: [float]
+        """
+        return [estimated - actual for estimated, actual in zip(self.estimated, self.actual)]
+
+    @property
+    def mean_absolute_error(self):
+        errors = self.errors
+        return sum(abs(error) for error in errors) / len(errors) if errors else None
+
+    @property
+    def mean_relative_error(self):
+        """
+        Mean absolute error relative to the actual time left (samples with no time left are skipped).
+        :return: float | None
+        """
+        relative = [abs(error) / actual for error, actual in zip(self.errors, self.actual) if actual > 0]
+        return sum(relative) / len(relative) if relative else None
+
+
+def replay_trace(trace, methods=("linear", "poly2"), time_memory=100, stride=1):
+    """
+    Feeds a timing trace through the time-left estimators of LoopPrinterTimer, exactly as the LoopPrinter would.
+    :param TimingTrace trace: The recorded run.
+    :param [str] methods: Time-left methods to evaluate (see LoopPrinter.loop_print).
+    :param int time_memory: Number of time-stamps kept in memory (downsampling as in LoopPrinter.loop_print).
+    :param int stride: Only estimate time left at every stride'th sample (prints are rarely made at every step).
+    :return: [ReplayResult]
+    """
+    total_counts = trace.total_counts if trace.total_counts is not None else trace.counts[-1]
+    end_time = trace.times[-1]
+    start_time = datetime(2000, 1, 1)
+
+    results = []
+    for method in methods:
+        result = ReplayResult(method=method, time_memory=time_memory)
+        timer = LoopPrinterTimer()
+        timer.time_left_method = method
+
+        for idx, (count, seconds) in enumerate(zip(trace.counts, trace.times)):
+            timer.update_times_steps(count=count, is_first_call=idx == 0, memory=time_memory,
+                                     now=start_time + timedelta(seconds=seconds))
+            if idx % stride != 0:
+                continue
+
+            # Only the estimator itself is timed
+            cpu_start = time.process_time()
+            estimated = timer.estimate_seconds_left(total_counts)
+            result.cpu_time += time.process_time() - cpu_start
+
+            if estimated is not None:
+                result.counts.append(count)
+                result.elapsed.append(seconds)
+                result.estimated.append(estimated)
+                result.actual.append(end_time - seconds)
+
+        results.append(result)
+
+    return results
+
+
+def replay_report(results, n_checkpoints=5):
+    """
+    Makes a printable report of replayed estimators.
+    :param [ReplayResult] results: Output of replay_trace().
+    :param int n_checkpoints: Number of points in time at which the error is reported.
+    :return: str
+    """
+    lines = ["{:<10s} {:>8s} {:>12s} {:>12s} {:>12s}".format("Method", "Memory", "Mean error", "Rel. error",
+                                                              "CPU time")]
+    for result in results:
+        mean_error = result.mean_absolute_error
+        relative_error = result.mean_relative_error
+        lines.append("{:<10s} {:>8d} {:>12s} {:>12s} {:>11.4f}s".format(
+            result.method, result.time_memory,
+            "-" if mean_error is None else "{:.3f}s".format(mean_error),
+            "-" if relative_error is None else "{:.2%}".format(relative_error),
+            result.cpu_time))
+
+    # Error over time
+    for result in results:
+        if not result.counts:
+            continue
+        lines.append("")
+        lines.append("{} error over time:".format(result.method))
+        n_samples = len(result.counts)
+        indices = sorted({round(idx * (n_samples - 1) / max(n_checkpoints - 1, 1)) for idx in range(n_checkpoints)})
+        for idx in indices:
+            lines.append("    count {:>8,d}: estimated {:10.3f}s, actual {:10.3f}s, error {:+10.3f}s".format(
+                result.counts[idx], result.estimated[idx], result.actual[idx],
+                result.estimated[idx] - result.actual[idx]))
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay timing traces against the time-left estimators.")
+    parser.add_argument("traces", nargs="*",
+                        help="Trace files. If none are given, the synthetic traces are used.")
+    parser.add_argument("--methods", nargs="+", default=["linear", "poly2"], help="Time-left methods.")
+    parser.add_argument("--time-memory", type=int, default=100, help="Number of time-stamps kept in memory.")
+    parser.add_argument("--stride", type=int, default=1, help="Estimate time left at every stride'th sample.")
+    args = parser.parse_args()
+
+    if args.traces:
+        traces = [(path, TimingTrace.load(path)) for path in args.traces]
+    else:
+        traces = [(kind, synthetic_trace(kind)) for kind in SYNTHETIC_TRACES]
+
+    for name, trace in traces:
+        results = replay_trace(trace, methods=args.methods, time_memory=args.time_memory, stride=args.stride)
+        print("{} ({} samples)".format(name, len(trace)))
+        print("-" * 75)
+        print(replay_report(results))
+        print("")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from loop_printer.src.utility import _bytes_str
+
+_STATM_PATH = "/proc/self/statm"
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _current_rss():
+    """
+    Current resident set size of the process in bytes (None if it can not be determined on this platform).
+    :return: int | None
+    """
+    try:
+        with open(_STATM_PATH, "rb") as file:
+            return int(file.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _peak_rss():
+    """
+    Peak resident set size of the process in bytes (None if it can not be determined on this platform).
+    :return: int | None
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class LoopResourceMonitor:
+    """
+    Samples memory- and CPU-usage of the process at the prints of the LoopPrinter.
+    Nothing is sampled between prints.
+    """
+    def __init__(self):
+        self.start_rss = None  # type: int
+        self.last_wall_time = None  # type: float
+        self.last_cpu_time = None  # type: float
+
+    def reset(self):
+        self.start_rss = _current_rss()
+        self.last_wall_time = None
+        self.last_cpu_time = None
+
+    def _cpu_usage(self):
+        """
+        Process CPU-time over wall-time since last sample (None at the first sample of a loop).
+        Above 100% when multiple threads are working.
+        :return: float | None
+        """
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+        usage = None
+        if self.last_wall_time is not None and wall_time > self.last_wall_time:
+            usage = (cpu_time - self.last_cpu_time) / (wall_time - self.last_wall_time)
+        self.last_wall_time = wall_time
+        self.last_cpu_time = cpu_time
+        return usage
+
+    def resource_message(self, memory, memory_peak, cpu_usage):
+        """
+        Produces the resource-message used by the LoopPrinter.
+        :param bool memory: Do you want the resident memory and its growth since the loop started?
+        :param bool memory_peak: Do you want the peak resident memory of the process?
+        :param bool cpu_usage: Do you want the CPU-utilisation since the last print?
+        :return: str
+        """
+        items = []
+
+        # Resident memory and growth
+        rss = _current_rss() if memory or memory_peak else None
+        if memory:
+            if rss is None:
+                items.append("RSS: {:>9s}, growth: {:>10s}".format("", ""))
+            else:
+                growth = rss - self.start_rss if self.start_rss is not None else 0
+                items.append("RSS: {:>9s}, growth: {:>10s}".format(
+                    _bytes_str(rss), ("+" if growth >= 0 else "-") + _bytes_str(abs(growth))))
+
+        # Peak memory
+        if memory_peak:
+            peak = _peak_rss()
+            # The peak is updated lazily by the kernel, so it can lag behind the current resident memory
+            if peak is not None and rss is not None:
+                peak = max(peak, rss)
+            items.append("peak: {:>9s}".format("" if peak is None else _bytes_str(peak)))
+
+        # CPU utilisation
+        if cpu_usage:
+            usage = self._cpu_usage()
+            items.append("CPU: {:>5s}".format("" if usage is None else "{:.0%}".format(usage)))
+
+        # Capital letter only on first stat
+        items[0] = items[0][0].upper() + items[0][1:]
+        return "[" + ", ".join(items) + "]"
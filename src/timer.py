@@ -4,6 +4,7 @@ import regex
 from scipy import optimize
 import numpy as np
 
+from loop_printer.src.history import RunProfile
 from loop_printer.src.utility import _delta_time_str, _precision_on_microseconds, _get_difference_formatter
 
 
@@ -20,6 +21,13 @@ class LoopPrinterTimer:
         self.stride_size = 1
         self.step_nr = 0
         self.last_time = None
+        self.record_profile = False
+        self.prior = None  # type: RunProfile
+        self.prior_weight = 10
+        self.last_call_time = None  # type: datetime
+        self.profile_steps = []  # type: [int]
+        self.profile_seconds = []  # type: [float]
+        self.profile_stride = 1
 
     def reset(self):
         self.time_stamps = []  # type: [timedelta]
@@ -29,27 +37,52 @@ class LoopPrinterTimer:
         self.stride_size = 1
         self.step_nr = 0
         self.last_time = None
-
-    def update_times_steps(self, count, is_first_call, memory):
+        self.record_profile = False
+        self.prior = None  # type: RunProfile
+        self.prior_weight = 10
+        self.last_call_time = None  # type: datetime
+        self.profile_steps = []  # type: [int]
+        self.profile_seconds = []  # type: [float]
+        self.profile_stride = 1
+
+    def update_times_steps(self, count, is_first_call, memory, now=None):
         """
         Updates the internal lists of information.
         :param int count: Current iteration.
         :param bool is_first_call: Indicates whether this is the first printing.
         :param int memory: maximum number of elements to be remembered for estimating timing information.
+        :param datetime now: Time of the call. Defaults to datetime.now() (other values are used for replaying traces).
         """
+        if now is None:
+            now = datetime.now()
         self.step_nr += 1
         if len(self.time_stamps) > 0:
             self.last_time = self.time_stamps[-1]
 
         if is_first_call:
-            self.start_time = datetime.now()
+            self.start_time = now
             self.steps = [count]
             self.step_nr = 1
             self.stride_size = 1
         else:
             if self.step_nr % self.stride_size == 0:
-                self.time_stamps.append(datetime.now() - self.start_time)
+                self.time_stamps.append(now - self.start_time)
                 self.steps.append(count)
+        self.last_call_time = now
+
+        # Aligned samples for run profiles (downsampled separately from the samples used for extrapolation)
+        if self.record_profile:
+            if is_first_call:
+                self.profile_steps = [count]
+                self.profile_seconds = [0.0]
+                self.profile_stride = 1
+            elif self.step_nr % self.profile_stride == 0:
+                self.profile_steps.append(count)
+                self.profile_seconds.append((now - self.start_time).total_seconds())
+                if len(self.profile_steps) > memory:
+                    self.profile_steps = self.profile_steps[::2]
+                    self.profile_seconds = self.profile_seconds[::2]
+                    self.profile_stride *= 2
 
         # Check whether memory is full
         if len(self.time_stamps) > memory:
@@ -67,13 +100,35 @@ class LoopPrinterTimer:
             # Increase stride for next datapoints
             self.stride_size *= 2
 
-    def estimate_time_left(self, use_microseconds, n):
+    def estimate_seconds_left(self, n):
+        """
+        Computes the estimated time left.
+        If a prior from previous runs is set, it is blended with the extrapolated estimate.
+        The prior weighs as prior_weight iterations, so the live estimate takes over as iterations pass.
+        :param int n: Total number of iterations in loop.
+        :return: float | None
+        """
+        time_left = self._extrapolate_seconds_left(n)
+
+        # Blend with prior
+        if self.prior is not None and self.steps:
+            prior_time_left = self.prior.seconds_left(count=self.steps[-1], first_count=self.steps[0],
+                                                      total_counts=n)
+            if time_left is None:
+                time_left = prior_time_left
+            else:
+                weight = self.prior_weight / (self.prior_weight + self.steps[-1] - self.steps[0])
+                time_left = weight * prior_time_left + (1 - weight) * time_left
+
+        # Return
+        return time_left
+
+    def _extrapolate_seconds_left(self, n):
         """
         Computes the estimated time left by fitting a polynomial function to the time of each iteration.
         By extrapolating these values it estimates time left.
-        :param bool use_microseconds: Indicates whether the returned string should have a microsecond precision.
         :param int n: Total number of iterations in loop.
-        :return: str
+        :return: float | None
         """
         n_steps = len(self.steps)
         time_left = None
@@ -124,17 +179,48 @@ class LoopPrinterTimer:
             parameters = p1[0]
 
             # Predict time left
-            time_left = max(0, fit_func(parameters, n) - seconds[-1])
-            time_left = timedelta(seconds=time_left)
+            time_left = float(max(0, fit_func(parameters, n) - seconds[-1]))
+
+        # Return
+        return time_left
+
+    def estimate_time_left(self, use_microseconds, n):
+        """
+        Computes the estimated time left as a printable string.
+        :param bool use_microseconds: Indicates whether the returned string should have a microsecond precision.
+        :param int n: Total number of iterations in loop.
+        :return: str
+        """
+        time_left = self.estimate_seconds_left(n)
 
         # If a time left has been computed convert to string
         if time_left is not None:
+            time_left = timedelta(seconds=time_left)
             time_left = _delta_time_str(time_left.days, time_left.seconds, time_left.microseconds,
                                         use_microseconds)
 
         # Return
         return time_left
 
+    def run_profile(self, total_counts, n_points):
+        """
+        Makes a step-time profile of the current run (used for estimating time left in later runs).
+        :param int total_counts: Total number of iterations in loop.
+        :param int n_points: Number of points in profile.
+        :return: RunProfile | None
+        """
+        if self.step_nr < 2:
+            return None
+        counts = list(self.profile_steps)
+        seconds = list(self.profile_seconds)
+
+        # Always end the profile with the last call
+        if counts[-1] != total_counts:
+            counts.append(total_counts)
+            seconds.append((self.last_call_time - self.start_time).total_seconds())
+        return RunProfile.from_run(counts=counts, seconds=seconds, first_count=counts[0],
+                                   total_counts=total_counts, n_points=n_points)
+
     def compute_timings(self, use_microseconds):
         """
         Compute timing statistics (time of last step, average step, total time).
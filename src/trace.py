@@ -0,0 +1,130 @@
+import random
+import struct
+import time
+from array import array
+
+# File layout: magic, version, total counts (-1 if unknown), number of samples,
+# followed by all counts (int64) and then all monotonic times (float64, seconds since first sample).
+_TRACE_MAGIC = b"LPTR"
+_TRACE_VERSION = 1
+_TRACE_HEADER = struct.Struct("<4sBqq")
+
+SYNTHETIC_TRACES = ("constant", "linear", "bursty", "warmup")
+
+
+class TimingTrace:
+    """
+    A recorded run of a loop: the counts passed on to the LoopPrinter and the monotonic times of the calls.
+    Times are in seconds relative to the first sample.
+    """
+    def __init__(self, counts=None, times=None, total_counts=None):
+        self.counts = array("q", counts if counts is not None else [])
+        self.times = array("d", times if times is not None else [])
+        self.total_counts = total_counts  # type: int
+
+    def __len__(self):
+        return len(self.counts)
+
+    def save(self, path):
+        """
+        Writes the trace to a compact binary file.
+        :param str path: Destination file.
+        """
+        total_counts = -1 if self.total_counts is None else self.total_counts
+        with open(path, "wb") as file:
+            file.write(_TRACE_HEADER.pack(_TRACE_MAGIC, _TRACE_VERSION, total_counts, len(self.counts)))
+            self.counts.tofile(file)
+            self.times.tofile(file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a trace written by TimingTrace.save().
+        :param str path: Trace file.
+        :return: TimingTrace
+        """
+        with open(path, "rb") as file:
+            magic, version, total_counts, n_samples = _TRACE_HEADER.unpack(file.read(_TRACE_HEADER.size))
+            if magic != _TRACE_MAGIC or version != _TRACE_VERSION:
+                raise ValueError("{} is not a loop_printer timing trace.".format(path))
+            trace = cls(total_counts=None if total_counts < 0 else total_counts)
+            trace.counts.fromfile(file, n_samples)
+            trace.times.fromfile(file, n_samples)
+        return trace
+
+
+class TimingTraceRecorder:
+    """
+    Records (count, monotonic time)-pairs of a loop for later replay against the time-left estimators.
+    Pass it to LoopPrinter(trace_recorder=...) and save the trace when the loop is done.
+    """
+    def __init__(self, path=None):
+        self.path = path  # type: str
+        self.trace = TimingTrace()
+        self._start = None  # type: float
+
+    def reset(self):
+        self.trace = TimingTrace()
+        self._start = None
+
+    def record(self, count, total_counts=None):
+        """
+        Records a single call.
+        :param int count: Current iteration (1-indexed, as used by the timer).
+        :param int total_counts: Total number of iterations in loop (if known).
+        """
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+            self.trace.total_counts = total_counts
+        self.trace.counts.append(count)
+        self.trace.times.append(now - self._start)
+
+    def save(self, path=None):
+        """
+        Saves the recorded trace.
+        :param str path: Destination file. Defaults to the path given at initialization.
+        """
+        path = path if path is not None else self.path
+        if path is None:
+            raise ValueError("No path given for saving timing trace.")
+        self.trace.save(path)
+
+
+def synthetic_trace(kind, n=500, step_seconds=0.01, seed=0):
+    """
+    Creates a synthetic timing trace for testing the time-left estimators.
+    :param str kind:
+        "constant"  : Every step takes the same time.
+        "linear"    : Step times grow linearly with the count.
+        "bursty"    : Mostly fast steps with occasional slow bursts.
+        "warmup"    : The first tenth of the steps are much slower than the rest.
+    :param int n: Number of steps.
+    :param float step_seconds: Base duration of a step.
+    :param int seed: Seed for the random jitter.
+    :return: TimingTrace
+    """
+    rng = random.Random(seed)
+    kind = kind.lower()
+
+    elapsed = 0.0
+    trace = TimingTrace(counts=[1], times=[0.0], total_counts=n)
+    for count in range(2, n + 1):
+        # Duration of the step
+        if kind == "constant":
+            duration = step_seconds
+        elif kind == "linear":
+            duration = step_seconds * 2.0 * count / n
+        elif kind == "bursty":
+            duration = step_seconds * (rng.uniform(5.0, 10.0) if rng.random() < 0.05 else rng.uniform(0.2, 0.8))
+        elif kind == "warmup":
+            duration = step_seconds * (10.0 if count <= n / 10 else 1.0)
+        else:
+            raise ValueError("Unknown synthetic trace: {}. Use one of {}.".format(kind, SYNTHETIC_TRACES))
+
+        # Small jitter on all steps
+        elapsed += duration * rng.uniform(0.95, 1.05)
+        trace.counts.append(count)
+        trace.times.append(elapsed)
+
+    return trace
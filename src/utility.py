@@ -1,4 +1,4 @@
-import collections
+import collections.abc
 import math
 
 import regex
@@ -89,6 +89,44 @@ def is_step(fraction, n, count, first_count):
     return float(count - 1) < current_split <= float(count)
 
 
+def next_step(fraction, n, count, first_count):
+    """
+    Finds the next iteration after count, which is a step (see is_step).
+    :param float fraction: Determines the frequency of prints.
+    :param int n: Total number of iterations.
+    :param int count: Current iteration.
+    :param int first_count: Starting iteration.
+    :return: int
+    """
+    # Absolute steps
+    if fraction < 0:
+        mod = round(abs(fraction))
+        return (count // mod + 1) * mod
+
+    # Convert to fraction
+    if fraction > 1:
+        fraction = max(2.0, fraction) - 1.0
+        fraction = 1.0 / fraction
+
+    # Compute step
+    step = (n - first_count) * fraction
+
+    while True:
+        # The next split (after count) is passed at the first iteration at or after it
+        next_split = math.floor(count / step) * step
+        if next_split <= count:
+            next_split += step
+        candidate = max(count + 1, math.ceil(next_split))
+
+        # Agree with is_step when the split is within floating point precision of an iteration
+        for neighbour in (candidate - 1, candidate, candidate + 1):
+            if neighbour > count and is_step(fraction=fraction, n=n, count=neighbour, first_count=first_count):
+                return neighbour
+
+        # The split is not a step in is_step, continue to the following split
+        count = candidate
+
+
 def _delta_time_str(days, seconds, microseconds, use_microseconds=False):
     """
     Turn days, seconds and microseconds into printable string.
@@ -199,11 +237,39 @@ def ensure_fraction_and_total(fraction, list_or_total):
         total_counts = int(list_or_total)
 
     # If list_or_total is a sized-collection, determine its size and use that for the number of iterations.
-    elif isinstance(list_or_total, collections.Sized):
+    elif isinstance(list_or_total, collections.abc.Sized):
         total_counts = len(list_or_total)
 
     # Otherwise something incorrect was given as list_or_total
     else:
         raise ValueError("total_counts is not set to anything useful in LoopPrinter")
 
-    return fraction, total_counts
\ No newline at end of file
+    return fraction, total_counts
+
+
+def _duration_ns_str(nanoseconds):
+    """
+    Turn a short duration into a compact printable string with a fitting unit.
+    :param int nanoseconds:
+    :return: str
+    """
+    if nanoseconds < 1000:
+        return "{:d}ns".format(nanoseconds)
+    if nanoseconds < 1000000:
+        return "{:.0f}µs".format(nanoseconds / 1e3)
+    if nanoseconds < 1000000000:
+        return "{:.1f}ms".format(nanoseconds / 1e6)
+    return "{:.2f}s".format(nanoseconds / 1e9)
+
+
+def _bytes_str(n_bytes):
+    """
+    Turn a number of bytes into a compact printable string with a fitting unit.
+    :param int n_bytes:
+    :return: str
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if n_bytes < 1024:
+            return "{:.1f}{}".format(n_bytes, unit) if unit != "B" else "{:d}B".format(int(n_bytes))
+        n_bytes /= 1024
+    return "{:.1f}TB".format(n_bytes)